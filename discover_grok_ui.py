@@ -7,46 +7,184 @@ Connects to existing Chrome/Grok session and discovers working UI patterns
 import asyncio
 import json
 from datetime import datetime
+from typing import NamedTuple
 from playwright.async_api import async_playwright
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Voice button patterns to test
+VOICE_SELECTORS = (
+    "[aria-label*='voice']",
+    "[aria-label*='Voice']",
+    "button[title*='voice']",
+    "button[title*='Voice']",
+    "[data-testid*='voice']",
+    "button:has-text('voice')",
+    "button:has-text('Voice')",
+    "[class*='voice']"
+)
+
+# Text input patterns
+TEXT_INPUT_SELECTORS = (
+    "textarea",
+    "input[type='text']",
+    "[contenteditable='true']",
+    "[role='textbox']",
+    "textarea[placeholder*='Ask']",
+    "textarea[placeholder*='Message']"
+)
+
+# New chat button patterns
+NEW_CHAT_SELECTORS = (
+    "button:has-text('New')",
+    "button:has-text('new')",
+    "[aria-label*='New']",
+    "[aria-label*='new']",
+    "a[href='/']",
+    "a[href='https://grok.com']",
+    "[class*='new']"
+)
+
+# Response container patterns
+RESPONSE_SELECTORS = (
+    "[class*='message']",
+    "[class*='response']",
+    "[role='log']",
+    "[data-testid*='message']",
+    "[data-testid*='response']"
+)
+
+# Error element patterns
+ERROR_SELECTORS = (
+    "[role='alert']",
+    "[class*='error']",
+    "[class*='Error']",
+    "[aria-label*='error']"
+)
+
+# Page state patterns used by detect_page_state
+MESSAGE_SELECTORS = ("[class*='message']", "[role='log']", "[class*='conversation']")
+EMPTY_INPUT_SELECTOR = "[contenteditable='true']"
+
+# Discovery only needs representative samples; long threads can match hundreds of messages
+MAX_PER_SELECTOR = 20
+
+# Every distinct selector, queried once per discovery run
+_ALL_SELECTORS = tuple(dict.fromkeys(
+    VOICE_SELECTORS + TEXT_INPUT_SELECTORS + NEW_CHAT_SELECTORS + RESPONSE_SELECTORS
+    + ERROR_SELECTORS + MESSAGE_SELECTORS
+))
+
+# Collects every visible element's details for the whole selector list in one
+# round-trip. Hidden elements and matches past maxPerSelector are dropped
+# in-page and never cross the CDP connection; invalid selectors are reported
+# back as error lines. Playwright's :has-text() is emulated as a
+# case-insensitive substring match since raw CDP has no selector engine.
+DESCRIBE_ELEMENTS_JS = """(sels, maxPerSelector) => {
+    const query = s => {
+        const hasText = s.match(/^(.*):has-text\\(['"](.*)['"]\\)$/);
+        if (!hasText) return document.querySelectorAll(s);
+        const text = hasText[2].toLowerCase();
+        return [...document.querySelectorAll(hasText[1] || "*")].filter(el =>
+            el.textContent.replace(/\\s+/g, " ").toLowerCase().includes(text));
+    };
+    const elements = [];
+    const errors = [];
+    for (const s of sels) {
+        try {
+            let index = -1;
+            let kept = 0;
+            for (const el of query(s)) {
+                index++;
+                if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) continue;
+                if (++kept > maxPerSelector) break;
+                const tag = el.tagName.toLowerCase();
+                elements.push({
+                    selector: s,
+                    index: index,
+                    tag: tag,
+                    text: tag !== "input" ? (el.innerText || "").slice(0, 100) : "",
+                    aria: el.getAttribute("aria-label") || "",
+                    placeholder: el.getAttribute("placeholder") || "",
+                    cls: el.getAttribute("class") || "",
+                    enabled: !el.disabled,
+                    box: (({x, y, width, height}) => ({x, y, width, height}))(el.getBoundingClientRect())
+                });
+            }
+        } catch (e) {
+            errors.push(`  Error with selector '${s}': ${e.message}`);
+        }
+    }
+    return {elements, errors};
+}"""
+
+# Page state indicators: existing messages and an empty (new conversation) input.
+# Only visible elements count, the same rule DESCRIBE_ELEMENTS_JS applies
+PAGE_STATE_JS = """(messageSels, inputSel) => {
+    const visible = el => el.offsetWidth || el.offsetHeight || el.getClientRects().length;
+    const input = [...document.querySelectorAll(inputSel)].find(visible);
+    return {
+        has_messages: messageSels.some(s => [...document.querySelectorAll(s)].some(visible)),
+        has_empty_input: !!input && !input.innerText.trim()
+    };
+}"""
+
+class ElementInfo(NamedTuple):
+    """A discovered element, kept as a tuple until findings are saved"""
+    selector: str
+    index: int
+    tag: str
+    visible: bool
+    enabled: bool
+    text: str
+    aria_label: str
+    placeholder: str
+    class_: str
+    bounding_box: dict
+    
+    def to_dict(self):
+        """Findings JSON form, with class_ saved under the "class" key"""
+        return {("class" if k == "class_" else k): v for k, v in self._asdict().items()}
+
+# Playwright driver and CDP connection shared by every discovery run in the process
+_PW_SINGLETON = {"pw": None, "browser": None, "lock": asyncio.Lock()}
+
 class GrokUIDiscovery:
-    def __init__(self, chrome_port=9222):
+    def __init__(self, chrome_port=9222, max_per_selector=MAX_PER_SELECTOR):
         self.chrome_port = chrome_port
-        self.playwright = None
+        self.max_per_selector = max_per_selector
         self.browser = None
         self.page = None
-        self.findings = {
-            "timestamp": datetime.now().isoformat(),
-            "url": "",
-            "voice_buttons": [],
-            "text_inputs": [],
-            "new_chat_buttons": [],
-            "response_containers": [],
-            "error_elements": []
-        }
+        self.cdp = None
+        self.selector_cache = {}
+        self.cache_complete = False  # prefetch ran without errors, so empty lists mean no match
+        self.findings = None  # Built by run_discovery
     
     async def connect(self):
         """Connect to existing Chrome session"""
         try:
-            print("Connecting to Chrome...")
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.connect_over_cdp(f"http://localhost:{self.chrome_port}")
+            async with _PW_SINGLETON["lock"]:
+                if _PW_SINGLETON["pw"] is None:
+                    _PW_SINGLETON["pw"] = await async_playwright().start()
+                browser = _PW_SINGLETON["browser"]
+                if browser is None or not browser.is_connected():
+                    print("Connecting to Chrome...")
+                    _PW_SINGLETON["browser"] = await _PW_SINGLETON["pw"].chromium.connect_over_cdp(f"http://localhost:{self.chrome_port}")
+                self.browser = _PW_SINGLETON["browser"]
             
             # Find Grok page
-            for context in self.browser.contexts:
-                for page in context.pages:
-                    if "grok.com" in page.url:
-                        self.page = page
-                        break
-                if self.page:
-                    break
+            pages = [p for ctx in self.browser.contexts for p in ctx.pages]
+            self.page = next((p for p in pages if "grok.com" in p.url), None)
             
             if not self.page:
                 print("No Grok page found. Please open grok.com in Chrome first.")
                 return False
             
             await self.page.bring_to_front()
-            self.findings["url"] = self.page.url
+            self.cdp = await self.page.context.new_cdp_session(self.page)
             print(f"Connected to: {self.page.url}")
             return True
             
@@ -54,148 +192,105 @@ class GrokUIDiscovery:
             print(f"Connection failed: {e}")
             return False
     
-    async def discover_elements(self, category, potential_selectors, description):
-        """Test selectors and find working ones"""
+    async def evaluate(self, js, *args):
+        """Call a JS function in the page via raw CDP Runtime.evaluate"""
+        expression = f"({js})({', '.join(json.dumps(a) for a in args)})"
+        response = await self.cdp.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": False
+        })
+        if "exceptionDetails" in response:
+            details = response["exceptionDetails"]
+            raise RuntimeError(details.get("exception", {}).get("description", details["text"]))
+        return response["result"].get("value")
+    
+    async def query_selectors(self, selectors):
+        """Map each selector to its visible matches, reusing cached results"""
+        results = {s: self.selector_cache[s] for s in selectors if s in self.selector_cache}
+        pending = [s for s in selectors if s not in results]
+        results.update({s: [] for s in pending})
+        
+        if not pending:
+            return results, []
+        try:
+            found = await self.evaluate(DESCRIBE_ELEMENTS_JS, pending, self.max_per_selector)
+        except Exception as e:
+            return results, [f"  Error with selectors {pending}: {e}"]
+        for d in found["elements"]:
+            results[d["selector"]].append(d)
+        return results, found["errors"]
+    
+    async def discover_elements(self, potential_selectors, description):
+        """Test selectors and yield each working element as it is found"""
+        found = 0
+        results, errors = await self.query_selectors(potential_selectors)
+        
+        # Print only after all awaits so concurrent categories don't interleave
         print(f"\n=== Discovering {description} ===")
-        working_selectors = []
+        for error in errors:
+            print(error)
         
         for selector in potential_selectors:
-            try:
-                elements = await self.page.locator(selector).all()
-                if elements:
-                    for i, element in enumerate(elements):
-                        try:
-                            is_visible = await element.is_visible()
-                            is_enabled = await element.is_enabled()
-                            
-                            if is_visible:
-                                # Get element details
-                                tag_name = await element.evaluate("el => el.tagName.toLowerCase()")
-                                text_content = await element.inner_text() if tag_name != "input" else ""
-                                aria_label = await element.get_attribute("aria-label") or ""
-                                placeholder = await element.get_attribute("placeholder") or ""
-                                class_name = await element.get_attribute("class") or ""
-                                
-                                element_info = {
-                                    "selector": selector,
-                                    "index": i,
-                                    "tag": tag_name,
-                                    "visible": is_visible,
-                                    "enabled": is_enabled,
-                                    "text": text_content[:100],
-                                    "aria_label": aria_label,
-                                    "placeholder": placeholder,
-                                    "class": class_name,
-                                    "bounding_box": await element.bounding_box()
-                                }
-                                
-                                working_selectors.append(element_info)
-                                print(f"Found: {selector} - {tag_name} - '{text_content[:50]}' - '{aria_label}'")
-                                
-                        except Exception as e:
-                            print(f"  Error testing element {i}: {e}")
-                            
-            except Exception as e:
-                print(f"  Error with selector '{selector}': {e}")
+            for d in results[selector]:
+                found += 1
+                print(f"Found: {selector} - {d['tag']} - '{d['text'][:50]}' - '{d['aria']}'")
+                yield ElementInfo(
+                    selector, d["index"], d["tag"], True, d["enabled"], d["text"],
+                    d["aria"], d["placeholder"], d["cls"], d["box"]
+                )
         
-        self.findings[category] = working_selectors
-        print(f"Found {len(working_selectors)} working {description}")
-        return working_selectors
+        print(f"Found {found} working {description}")
     
     async def run_discovery(self):
         """Run full UI discovery"""
+        self.findings = {
+            "timestamp": datetime.now().isoformat(),
+            "url": "",
+            "voice_buttons": [],
+            "text_inputs": [],
+            "new_chat_buttons": [],
+            "response_containers": [],
+            "error_elements": []
+        }
         if not await self.connect():
             return False
+        self.findings["url"] = self.page.url
         
-        # Voice button patterns to test
-        voice_selectors = [
-            "[aria-label*='voice']",
-            "[aria-label*='Voice']", 
-            "button[title*='voice']",
-            "button[title*='Voice']",
-            "[data-testid*='voice']",
-            "button:has-text('voice')",
-            "button:has-text('Voice')",
-            "[class*='voice']"
-        ]
-        
-        # Text input patterns
-        text_input_selectors = [
-            "textarea",
-            "input[type='text']",
-            "[contenteditable='true']",
-            "[role='textbox']",
-            "textarea[placeholder*='Ask']",
-            "textarea[placeholder*='Message']"
-        ]
+        # Prefetch every distinct selector once; categories and state detection read the cache
+        self.selector_cache, errors = await self.query_selectors(_ALL_SELECTORS)
+        self.cache_complete = not errors
+        for error in errors:
+            print(error)
         
-        # New chat button patterns
-        new_chat_selectors = [
-            "button:has-text('New')",
-            "button:has-text('new')",
-            "[aria-label*='New']",
-            "[aria-label*='new']",
-            "a[href='/']",
-            "a[href='https://grok.com']",
-            "[class*='new']"
-        ]
+        async def collect(category, selectors, description):
+            async for element_info in self.discover_elements(selectors, description):
+                self.findings[category].append(element_info)
         
-        # Response container patterns
-        response_selectors = [
-            "[class*='message']",
-            "[class*='response']",
-            "[role='log']",
-            "[data-testid*='message']",
-            "[data-testid*='response']"
-        ]
-        
-        # Error element patterns
-        error_selectors = [
-            "[role='alert']",
-            "[class*='error']",
-            "[class*='Error']",
-            "[aria-label*='error']"
-        ]
-        
-        # Run discoveries
-        await self.discover_elements("voice_buttons", voice_selectors, "voice buttons")
-        await self.discover_elements("text_inputs", text_input_selectors, "text inputs")
-        await self.discover_elements("new_chat_buttons", new_chat_selectors, "new chat buttons")
-        await self.discover_elements("response_containers", response_selectors, "response containers")
-        await self.discover_elements("error_elements", error_selectors, "error elements")
+        # Run discoveries concurrently - each writes its own findings key
+        await asyncio.gather(
+            collect("voice_buttons", VOICE_SELECTORS, "voice buttons"),
+            collect("text_inputs", TEXT_INPUT_SELECTORS, "text inputs"),
+            collect("new_chat_buttons", NEW_CHAT_SELECTORS, "new chat buttons"),
+            collect("response_containers", RESPONSE_SELECTORS, "response containers"),
+            collect("error_elements", ERROR_SELECTORS, "error elements")
+        )
         
         return True
     
     async def detect_page_state(self):
         """Auto-detect what state the page is in based on visible elements"""
-        # Check for indicators of different states
-        indicators = {
-            "has_messages": False,
-            "has_empty_input": False,
-            "has_voice_button": False,
-            "has_response_area": False
-        }
-        
         try:
-            # Check for existing messages/conversation
-            message_selectors = ["[class*='message']", "[role='log']", "[class*='conversation']"]
-            for selector in message_selectors:
-                if await self.page.locator(selector).count() > 0:
-                    indicators["has_messages"] = True
-                    break
-            
-            # Check for empty input (new conversation indicator)
-            input_elements = await self.page.locator("[contenteditable='true']").all()
-            for element in input_elements:
-                if await element.is_visible():
-                    text = await element.inner_text()
-                    if not text.strip():
-                        indicators["has_empty_input"] = True
-                    break
-            
-            # Check for voice button
-            voice_elements = await self.page.locator("[aria-label*='voice']").all()
-            indicators["has_voice_button"] = len(voice_elements) > 0
+            if self.cache_complete:
+                # Reuse the discovery prefetch instead of querying the page again
+                inputs = self.selector_cache[EMPTY_INPUT_SELECTOR]
+                indicators = {
+                    "has_messages": any(self.selector_cache[s] for s in MESSAGE_SELECTORS),
+                    "has_empty_input": bool(inputs) and not inputs[0]["text"].strip()
+                }
+            else:
+                # All indicators are computed in-page with a single round-trip
+                indicators = await self.evaluate(PAGE_STATE_JS, MESSAGE_SELECTORS, EMPTY_INPUT_SELECTOR)
             
             # Determine state
             if indicators["has_messages"]:
@@ -213,27 +308,50 @@ class GrokUIDiscovery:
     
     async def save_findings(self, filename=None):
         """Save findings to JSON file with auto-detected state naming"""
+        state = await self.detect_page_state()
         if filename is None:
-            state = await self.detect_page_state()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.fromisoformat(self.findings["timestamp"]).strftime("%Y%m%d_%H%M%S")
             filename = f"grok_ui_{state}_{timestamp}.json"
         
         # Add detected state to findings
-        self.findings["detected_state"] = await self.detect_page_state()
+        self.findings["detected_state"] = state
         
-        with open(filename, "w") as f:
-            json.dump(self.findings, f, indent=2)
+        # Element tuples only become dicts at serialization time
+        findings = {k: [e.to_dict() for e in v] if isinstance(v, list) else v for k, v in self.findings.items()}
+        
+        if orjson:
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(findings, option=orjson.OPT_INDENT_2))
+        else:
+            # iterencode streams chunks instead of building the full string
+            with open(filename, "w") as f:
+                for chunk in json.JSONEncoder(indent=2).iterencode(findings):
+                    f.write(chunk)
         print(f"\nFindings saved to: {filename}")
         return filename
     
     
     async def cleanup(self):
-        """Cleanup resources"""
+        """Release this run's page; the shared connection stays open for reuse"""
         try:
-            if self.playwright:
-                await self.playwright.stop()
+            if self.cdp:
+                await self.cdp.detach()
         except Exception as e:
             print(f"Cleanup error: {e}")
+        self.cdp = None
+        self.page = None
+    
+    @classmethod
+    async def shutdown(cls):
+        """Stop the shared Playwright driver"""
+        async with _PW_SINGLETON["lock"]:
+            try:
+                if _PW_SINGLETON["pw"]:
+                    await _PW_SINGLETON["pw"].stop()
+            except Exception as e:
+                print(f"Cleanup error: {e}")
+            _PW_SINGLETON["pw"] = None
+            _PW_SINGLETON["browser"] = None
 
 async def main():
     """Run UI discovery"""
@@ -258,6 +376,7 @@ async def main():
             
     finally:
         await discovery.cleanup()
+        await GrokUIDiscovery.shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
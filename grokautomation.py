@@ -5,17 +5,19 @@ Combines CDP connection, voice button detection, TTS streaming, and response cap
 """
 
 import asyncio
-import tempfile
+import csv
 import os
-import pandas as pd
 from playwright.async_api import async_playwright
-import edge_tts
-import sounddevice as sd
-import soundfile as sf
+import tts_stream
 import json
 from datetime import datetime
 import argparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class GrokAutomator:
     # Proven selectors from UI discovery JSON files
     VOICE_SELECTOR = "[aria-label*='voice']"
@@ -24,20 +26,132 @@ class GrokAutomator:
     RESPONSE_SELECTOR = "[class*='message']"
     NEW_CHAT_SELECTOR = "a[href='/']"
     ERROR_SELECTOR = "[role='alert']"
+    
+    # config.json settings bound as attributes in __init__
+    CONFIG_KEYS = (
+        "chrome_port", "max_response_chars", "max_wait_time", "tts_voice", "tts_rate",
+        "audio_wait_seconds", "transcription_wait_seconds", "new_conversation_wait",
+        "min_response_length", "required_stable_checks", "progress_bar_length",
+        "stabilization_check_interval", "response_quiet_seconds", "max_retries", "retry_delay"
+    )
+    
+    # Playwright's visibility rule: a non-empty box and not visibility:hidden.
+    # Unlike offsetParent this also holds for position:fixed toasts and alerts
+    IS_VISIBLE_JS = """el => {
+        const box = el.getBoundingClientRect();
+        return box.width > 0 && box.height > 0 && getComputedStyle(el).visibility !== "hidden";
+    }"""
+    
+    # Visible error text (ignoring Grok's own banners), message count and
+    # latest message text in a single round-trip
+    SNAPSHOT_JS = """({responseSelector, errorSelector}) => {
+        const isVisible = """ + IS_VISIBLE_JS + """;
+        const msgs = document.querySelectorAll(responseSelector);
+        const alert = [...document.querySelectorAll(errorSelector)].find(e =>
+            isVisible(e) && e.innerText.trim() && !e.innerText.toLowerCase().includes("grok"));
+        return {
+            text: msgs.length ? msgs[msgs.length - 1].innerText.trim() : "",
+            count: msgs.length,
+            error: alert ? alert.innerText.trim() : null
+        };
+    }"""
+    
+    # Watches the page and pushes the latest response to the grokDelta binding
+    # whenever it changes (throttled to intervalMs), and once more with
+    # stable=true after it has been unchanged for stableMs. Until the count passes
+    # replyAfterCount the last message is the user's own prompt, so the stable
+    # timer only runs once Grok's reply exists (armed at install if it already does)
+    RESPONSE_OBSERVER_JS = """({intervalMs, stableMs, replyAfterCount, responseSelector, errorSelector}) => {
+        window.__grokStopObserver?.();
+        const snapshot = () => (""" + SNAPSHOT_JS + """)({responseSelector, errorSelector});
+        let last = snapshot();
+        let throttle = null;
+        let stableTimer = null;
+        const armStable = () => {
+            clearTimeout(stableTimer);
+            if (last.count <= replyAfterCount) return;
+            stableTimer = setTimeout(() => window.grokDelta({...last, stable: true}), stableMs);
+        };
+        const observer = new MutationObserver(() => {
+            const snap = snapshot();
+            if (snap.text === last.text && snap.count === last.count && snap.error === last.error) return;
+            last = snap;
+            if (!throttle) throttle = setTimeout(() => {
+                throttle = null;
+                window.grokDelta({...last, stable: false});
+            }, intervalMs);
+            armStable();
+        });
+        observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+        window.__grokStopObserver = () => {
+            observer.disconnect();
+            clearTimeout(throttle);
+            clearTimeout(stableTimer);
+        };
+        window.grokDelta({...last, stable: false});
+        armStable();
+    }"""
+
+    # Fallback for pages without the binding: the whole wait runs in one evaluate,
+    # resolving with the snapshot once it is unchanged for stableChecks intervals
+    # and longer than minLen, shows an error (other than rate limiting) or reaches maxChars.
+    # As in the observer, text only counts once the count passes replyAfterCount
+    RESPONSE_POLLER_JS = """async ({intervalMs, stableChecks, timeoutMs, minLen, maxChars, replyAfterCount,
+                                   responseSelector, errorSelector}) => {
+        const snapshot = () => (""" + SNAPSHOT_JS + """)({responseSelector, errorSelector});
+        const deadline = Date.now() + timeoutMs;
+        let last = snapshot();
+        let unchanged = 0;
+        while (Date.now() < deadline) {
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+            const snap = snapshot();
+            if (snap.error && !/rate limit|too many/i.test(snap.error)) return {...snap, stable: false};
+            unchanged = snap.text === last.text && snap.count === last.count ? unchanged + 1 : 0;
+            last = snap;
+            if (snap.count <= replyAfterCount) continue;
+            if (snap.text.length >= maxChars) return {...snap, stable: false};
+            if (unchanged >= stableChecks && snap.text.length > minLen) return {...snap, stable: true};
+        }
+        return {...last, stable: false};
+    }"""
+
+    # Visible/enabled state of the first match (same rules as is_visible/is_enabled), null if none
+    ELEMENT_STATE_JS = """els => {
+        const el = els[0];
+        if (!el) return null;
+        const isVisible = """ + IS_VISIBLE_JS + """;
+        return {v: isVisible(el), e: !el.disabled && el.getAttribute("aria-disabled") !== "true"};
+    }"""
 
-    def __init__(self):
+    def __init__(self, config=None):
         self.browser = None
         self.grok_page = None
-        self.results = []
+        self.locators = {}
+        self.first_locators = {}
+        self.text_input_handle = None
+        self.handle_releases = set()  # dispose() tasks scheduled from navigation events
+        self.results_written = 0
+        self.response_waiter = None
+        self.bound_page = None  # page the grokDelta binding is registered on
+        self.response_text = ""
+        self.reply_after_count = 0  # message count once the user's prompt bubble is added
+        self.next_prompt_text = None
+        self.next_audio = None  # (text, task) for speech synthesized ahead of time
         self.playwright = None
-        self.config = self.load_config()
+        self.voice_enabled = True
+        self.voice_broken = False
+        self.voice_clicked = False  # voice button clicked for the current prompt
+        self.config = config or self.load_config()
+        # Plain attribute loads instead of a dict lookup on every use
+        for key in self.CONFIG_KEYS:
+            setattr(self, key, self.config[key])
     
     def load_config(self):
         """Load configuration from config.json"""
         try:
             if os.path.exists("config.json"):
-                with open("config.json", "r") as f:
-                    config = json.load(f)
+                with open("config.json", "rb") as f:
+                    config = orjson.loads(f.read()) if orjson else json.load(f)
                     print(f"Loaded config from config.json")
                     return config
             else:
@@ -47,50 +161,100 @@ class GrokAutomator:
             print("Please create a config.json file with required parameters")
             raise
     
+    def build_locators(self):
+        """Cache the first-match locator for each selector on the current page"""
+        selectors = (self.VOICE_SELECTOR, self.EXIT_VOICE_SELECTOR, self.TEXT_INPUT_SELECTOR,
+                     self.NEW_CHAT_SELECTOR, self.RESPONSE_SELECTOR)
+        self.locators = {sel: self.grok_page.locator(sel) for sel in selectors}
+        self.first_locators = {sel: loc.first for sel, loc in self.locators.items()}
+    
     async def find_element(self, selector, description="element"):
         """Find and return element by selector"""
         try:
-            element = self.grok_page.locator(selector).first
-            if await element.is_visible() and await element.is_enabled():
+            # One round trip instead of two; evaluate_all doesn't wait for a match to appear
+            state = await self.locators[selector].evaluate_all(self.ELEMENT_STATE_JS)
+            if state and state["v"] and state["e"]:
                 print(f"Found {description}")
-                return element
+                return self.first_locators[selector]
         except Exception as e:
             print(f"Error finding {description}: {e}")
         print(f"{description.capitalize()} not found")
         return None
     
+    async def wait_for_state(self, selector, state, timeout):
+        """Wait up to timeout seconds for the selector's first match to reach state"""
+        try:
+            await self.first_locators[selector].wait_for(state=state, timeout=timeout * 1000)
+            return True
+        except Exception:
+            return False
+    
+    async def get_text_input(self):
+        """Text input ElementHandle, resolved once per page and dropped on navigation"""
+        if not self.text_input_handle:
+            self.text_input_handle = await self.grok_page.wait_for_selector(
+                self.TEXT_INPUT_SELECTOR, state="visible", timeout=5000)
+        return self.text_input_handle
+    
+    async def dispose_handle(self, handle):
+        """Dispose an ElementHandle in the page, ignoring ones whose context is gone"""
+        try:
+            await handle.dispose()
+        except Exception:
+            pass
+    
+    async def release_text_input(self):
+        """Forget the cached text input handle and dispose it"""
+        handle, self.text_input_handle = self.text_input_handle, None
+        if handle:
+            await self.dispose_handle(handle)
+    
+    def on_frame_navigated(self, frame):
+        """Release cached element handles when the main frame navigates"""
+        # Same-document navigations (new chat) keep the context alive, so the
+        # handle would otherwise pin the old input node for the whole run
+        if frame.parent_frame is None and self.text_input_handle:
+            handle, self.text_input_handle = self.text_input_handle, None
+            task = asyncio.create_task(self.dispose_handle(handle))
+            self.handle_releases.add(task)
+            task.add_done_callback(self.handle_releases.discard)
+    
+    async def get_snapshot(self):
+        """Get UI error, message count and latest message text in one call"""
+        return await self.grok_page.evaluate(self.SNAPSHOT_JS, {
+            "responseSelector": self.RESPONSE_SELECTOR,
+            "errorSelector": self.ERROR_SELECTOR
+        })
+    
     async def detect_ui_errors(self):
         """Detect if there are any error messages in the UI"""
         try:
-            elements = await self.grok_page.locator(self.ERROR_SELECTOR).all()
-            for element in elements:
-                if await element.is_visible():
-                    error_text = await element.inner_text()
-                    if error_text.strip() and "grok" not in error_text.lower():
-                        return error_text.strip()
+            return (await self.get_snapshot())["error"]
         except Exception:
-            pass
-        return None
+            return None
     
-    async def has_messages(self):
-        """Check if page has messages (thread view)"""
+    async def get_last_message_text(self):
+        """Get latest message text - None when there are no messages (new conversation)"""
         try:
-            count = await self.grok_page.locator(self.RESPONSE_SELECTOR).count()
-            return count > 0
+            snapshot = await self.get_snapshot()
         except Exception:
-            return False
+            return None
+        return snapshot["text"] if snapshot["count"] else None
     
     async def is_new_conversation(self):
         """Check if we're in new conversation state (no messages)"""
-        return not await self.has_messages()
+        return await self.get_last_message_text() is None
     
     def load_existing_results(self, results_file):
         """Load existing results to enable resume functionality"""
         completed_ids = set()
         if os.path.exists(results_file):
             try:
-                existing_df = pd.read_csv(results_file, encoding='utf-8')
-                completed_ids = set(existing_df['id'].tolist())
+                # Only the id column is needed - skip building a dict per (large) row
+                with open(results_file, newline='', encoding='utf-8-sig') as f:
+                    reader = csv.reader(f)
+                    id_column = next(reader).index('id')
+                    completed_ids = {row[id_column] for row in reader if row}
                 print(f"Found {len(completed_ids)} already completed prompts in {results_file}")
             except Exception as e:
                 print(f"Error reading existing results: {e}")
@@ -103,8 +267,8 @@ class GrokAutomator:
         
     async def connect_to_chrome_with_retry(self):
         """Connect to Chrome browser via CDP with retry logic"""
-        max_retries = self.config["max_retries"]
-        retry_delay = self.config["retry_delay"]
+        max_retries = self.max_retries
+        retry_delay = self.retry_delay
         
         for attempt in range(max_retries):
             try:
@@ -114,7 +278,7 @@ class GrokAutomator:
                 # Add timeout for CDP connection
                 try:
                     self.browser = await asyncio.wait_for(
-                        self.playwright.chromium.connect_over_cdp(f"http://localhost:{self.config['chrome_port']}"),
+                        self.playwright.chromium.connect_over_cdp(f"http://localhost:{self.chrome_port}"),
                         timeout=10
                     )
                 except asyncio.TimeoutError:
@@ -141,40 +305,7 @@ class GrokAutomator:
                 
                 if not self.grok_page:
                     print("No Grok tab found, creating new one...")
-                    self.grok_page = await context.new_page()
-                    
-                    # Navigate with timeout and retry
-                    navigation_success = False
-                    for nav_attempt in range(3):
-                        try:
-                            await asyncio.wait_for(
-                                self.grok_page.goto("https://grok.com", wait_until="domcontentloaded"),
-                                timeout=30
-                            )
-                            await asyncio.wait_for(
-                                self.grok_page.wait_for_load_state("networkidle", timeout=30000),
-                                timeout=35
-                            )
-                            navigation_success = True
-                            break
-                        except asyncio.TimeoutError:
-                            print(f"Navigation timeout on attempt {nav_attempt + 1}")
-                            if nav_attempt < 2:
-                                await asyncio.sleep(5)
-                                continue
-                            else:
-                                raise Exception("Navigation to grok.com timed out")
-                        except Exception as e:
-                            print(f"Navigation error on attempt {nav_attempt + 1}: {e}")
-                            if nav_attempt < 2:
-                                await asyncio.sleep(5)
-                                continue
-                            else:
-                                raise
-                    
-                    if not navigation_success:
-                        raise Exception("Failed to navigate to grok.com")
-                        
+                    await self.open_grok_tab(context)
                 else:
                     print("Using existing Grok tab")
                     try:
@@ -187,19 +318,11 @@ class GrokAutomator:
                     except Exception as e:
                         print(f"Existing tab seems unresponsive: {e}")
                         print("Creating new tab...")
-                        self.grok_page = await context.new_page()
-                        await asyncio.wait_for(
-                            self.grok_page.goto("https://grok.com", wait_until="domcontentloaded"),
-                            timeout=30
-                        )
-                        await asyncio.wait_for(
-                            self.grok_page.wait_for_load_state("networkidle", timeout=30000),
-                            timeout=35
-                        )
+                        await self.open_grok_tab(context)
                 
-                # Set page timeouts
-                self.grok_page.set_default_timeout(30000)
-                self.grok_page.set_default_navigation_timeout(30000)
+                await self.prepare_page()
+                await self.warm_up()
+                self.voice_broken = False
                 
                 print("Chrome connection established successfully")
                 return True
@@ -233,20 +356,82 @@ class GrokAutomator:
         
         return False
     
+    async def open_grok_tab(self, context):
+        """Open a new tab on grok.com as this automator's page"""
+        self.grok_page = await context.new_page()
+        
+        # Navigate with timeout and retry
+        for nav_attempt in range(3):
+            try:
+                await asyncio.wait_for(
+                    self.grok_page.goto("https://grok.com", wait_until="domcontentloaded"),
+                    timeout=30
+                )
+                await self.wait_for_page_ready()
+                return
+            except asyncio.TimeoutError:
+                print(f"Navigation timeout on attempt {nav_attempt + 1}")
+                if nav_attempt < 2:
+                    await asyncio.sleep(5)
+                else:
+                    raise Exception("Navigation to grok.com timed out")
+            except Exception as e:
+                print(f"Navigation error on attempt {nav_attempt + 1}: {e}")
+                if nav_attempt < 2:
+                    await asyncio.sleep(5)
+                else:
+                    raise
+    
+    async def wait_for_page_ready(self):
+        """Wait for the chat input - grok.com keeps connections open so it never goes network-idle"""
+        await self.release_text_input()
+        self.text_input_handle = await self.grok_page.wait_for_selector(
+            self.TEXT_INPUT_SELECTOR, state="visible", timeout=15000)
+    
+    async def prepare_page(self):
+        """Set timeouts, locators and the response binding on the current page"""
+        self.grok_page.set_default_timeout(30000)
+        self.grok_page.set_default_navigation_timeout(30000)
+        self.build_locators()
+        if self.bound_page is self.grok_page:
+            return
+        self.grok_page.on("framenavigated", self.on_frame_navigated)
+        try:
+            await self.grok_page.expose_binding("grokDelta", self.on_response_delta)
+            self.bound_page = self.grok_page
+        except Exception as e:
+            print(f"Warning: could not register response binding, polling in page instead: {e}")
+    
+    async def warm_up(self):
+        """Resolve the text input once after connecting so the first prompt doesn't pay for it"""
+        try:
+            await self.get_text_input()
+        except Exception as e:
+            print(f"Text input not ready yet: {e}")
+    
+    async def open_worker(self):
+        """Create an automator that shares this browser connection in its own tab"""
+        worker = GrokAutomator(self.config)
+        worker.browser = self.browser
+        await worker.open_grok_tab(self.browser.contexts[0])
+        await worker.prepare_page()
+        return worker
+    
     async def exit_voice_mode(self):
         """Exit voice mode if currently active"""
-        for attempt in range(self.config["max_retries"]):
+        for attempt in range(self.max_retries):
             element = await self.find_element(self.EXIT_VOICE_SELECTOR, "exit voice button")
             if element:
                 try:
                     await element.click()
-                    await asyncio.sleep(2)  # Wait for voice mode to exit
+                    # Wait for voice mode to exit - returns as soon as the button is gone
+                    await self.wait_for_state(self.EXIT_VOICE_SELECTOR, "hidden", 2)
                     print("Exited voice mode")
                     return True
                 except Exception as e:
                     print(f"Exit voice button click failed: {e}")
-                    if attempt < self.config["max_retries"] - 1:
-                        await asyncio.sleep(self.config["retry_delay"])
+                    if attempt < self.max_retries - 1:
+                        await asyncio.sleep(self.retry_delay)
                         continue
             else:
                 # No exit voice button found, likely not in voice mode
@@ -256,59 +441,78 @@ class GrokAutomator:
 
     async def try_voice_mode(self):
         """Try to activate voice mode with error checking"""
-        for attempt in range(self.config["max_retries"]):
+        for attempt in range(self.max_retries):
             element = await self.find_element(self.VOICE_SELECTOR, "voice button")
             if element:
                 try:
                     await element.click()
-                    await asyncio.sleep(self.config["audio_wait_seconds"])
+                    self.voice_clicked = True
+                    await asyncio.sleep(self.audio_wait_seconds)
                     
                     # Check for errors after clicking
                     error_msg = await self.detect_ui_errors()
                     if error_msg:
                         print(f"Voice mode error: {error_msg}")
-                        if attempt < self.config["max_retries"] - 1:
-                            await asyncio.sleep(self.config["retry_delay"])
+                        if attempt < self.max_retries - 1:
+                            await asyncio.sleep(self.retry_delay)
                             continue
-                        return False
+                        break
                     
                     print("Voice mode activated")
                     return True
                 except Exception as e:
                     print(f"Voice button click failed: {e}")
-                    if attempt < self.config["max_retries"] - 1:
-                        await asyncio.sleep(self.config["retry_delay"])
+                    if attempt < self.max_retries - 1:
+                        await asyncio.sleep(self.retry_delay)
                         continue
             else:
-                if attempt < self.config["max_retries"] - 1:
-                    await asyncio.sleep(self.config["retry_delay"])
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(self.retry_delay)
                     continue
+        
+        # Don't pay for these retries again on every prompt - use text until reconnect
+        print("Voice mode unavailable, using text input for this session")
+        self.voice_broken = True
         return False
     
+    async def synthesize_speech(self, text):
+        """Generate TTS audio with edge-tts and return the encoded bytes"""
+        return await tts_stream.synthesize(text, self.tts_voice, self.tts_rate)
+    
+    def prefetch_speech(self, text):
+        """Start synthesizing upcoming speech in the background"""
+        if not text or (self.next_audio and self.next_audio[0] == text):
+            return
+        if self.next_audio:
+            self.next_audio[1].cancel()
+        self.next_audio = (text, asyncio.create_task(self.synthesize_speech(text)))
+    
+    async def get_speech(self, text):
+        """Return audio for text, reusing prefetched synthesis when available"""
+        if self.next_audio and self.next_audio[0] == text:
+            task = self.next_audio[1]
+            self.next_audio = None
+            try:
+                return await task
+            except Exception as e:
+                print(f"Prefetched TTS failed, synthesizing again: {e}")
+        return await self.synthesize_speech(text)
+    
     async def generate_and_stream_tts(self, text):
         """Generate TTS audio and stream to virtual microphone"""
         print(f"Converting to speech: '{text}'")
         
-        # Create temporary file for audio
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-        
         try:
-            # Generate TTS audio using edge-tts
-            communicate = edge_tts.Communicate(text, self.config["tts_voice"], rate=self.config["tts_rate"])
-            await communicate.save(tmp_path)
-            
-            # Load audio data
-            data, samplerate = sf.read(tmp_path)
+            audio = await self.get_speech(text)
             
             print("Streaming audio to virtual microphone...")
-            # Stream to default recording device (should be VB-Cable)
-            sd.play(data, samplerate)
-            sd.wait()  # Wait for playback to complete
+            # Stream to default recording device (should be VB-Cable). Blocking decode
+            # and playback run in a worker thread so the browser connection stays serviced
+            await asyncio.to_thread(tts_stream.play, audio)
             
             # Wait for Grok to finish transcribing the audio
             print("Waiting for transcription to complete...")
-            await asyncio.sleep(self.config["transcription_wait_seconds"])
+            await asyncio.sleep(self.transcription_wait_seconds)
             
             print("TTS and transcription complete")
             return True
@@ -316,29 +520,27 @@ class GrokAutomator:
         except Exception as e:
             print(f"Error with TTS: {e}")
             return False
-            
-        finally:
-            # Cleanup
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
     
     async def send_text_input(self, text):
         """Send text input with retry logic"""
-        for attempt in range(self.config["max_retries"]):
-            element = await self.find_element(self.TEXT_INPUT_SELECTOR, "text input")
+        for attempt in range(self.max_retries):
+            try:
+                element = await self.get_text_input()
+            except Exception:
+                element = await self.find_element(self.TEXT_INPUT_SELECTOR, "text input")
             if element:
                 try:
-                    await element.click()
+                    # fill() focuses the input itself and also handles contenteditable
                     await element.fill(text)
-                    await self.grok_page.keyboard.press("Enter")
+                    await element.press("Enter")
                     
                     # Brief wait and error check
                     await asyncio.sleep(1)
                     error_msg = await self.detect_ui_errors()
                     if error_msg:
                         print(f"Text input error: {error_msg}")
-                        if attempt < self.config["max_retries"] - 1:
-                            await asyncio.sleep(self.config["retry_delay"])
+                        if attempt < self.max_retries - 1:
+                            await asyncio.sleep(self.retry_delay)
                             continue
                         return False
                     
@@ -346,94 +548,124 @@ class GrokAutomator:
                     return True
                 except Exception as e:
                     print(f"Text input failed: {e}")
-                    if attempt < self.config["max_retries"] - 1:
-                        await asyncio.sleep(self.config["retry_delay"])
+                    # Handle may have been detached by a re-render - resolve it again
+                    await self.release_text_input()
+                    if attempt < self.max_retries - 1:
+                        await asyncio.sleep(self.retry_delay)
                         continue
             else:
-                if attempt < self.config["max_retries"] - 1:
-                    await asyncio.sleep(self.config["retry_delay"])
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(self.retry_delay)
                     continue
         return False
     
-    async def get_latest_response(self):
-        """Get latest response text"""
-        try:
-            elements = await self.grok_page.locator(self.RESPONSE_SELECTOR).all()
-            if elements:
-                last_response = elements[-1]
-                text = await last_response.inner_text()
-                return text.strip() if text else ""
-        except Exception:
-            pass
-        return ""
+    def on_response_delta(self, source, delta):
+        """Handle a response update pushed by RESPONSE_OBSERVER_JS"""
+        waiter = self.response_waiter
+        if waiter is None or waiter.done():
+            return
+        
+        error_msg = delta["error"]
+        if error_msg and "grok" not in error_msg.lower():
+            # Rate limit detection - keep waiting, bounded by max_wait_time
+            if "rate limit" in error_msg.lower() or "too many" in error_msg.lower():
+                print("Rate limit detected, waiting...")
+                return
+            waiter.set_result(f"Error: {error_msg}")
+            return
+        
+        # Check if we're still in the right state
+        if delta["count"] == 0 and self.response_text:
+            waiter.set_result("Error: Lost thread view during response")
+            return
+        
+        # Until Grok's reply appears the last message is the user's own prompt
+        if delta["count"] <= self.reply_after_count:
+            return
+        
+        current_text = delta["text"]
+        if len(current_text) > self.min_response_length:
+            self.response_text = current_text
+            max_chars = self.max_response_chars
+            
+            # Check if we've hit the character limit
+            if len(current_text) >= max_chars:
+                print(f"Character limit reached: {len(current_text)} chars, truncating")
+                waiter.set_result(current_text[:max_chars])
+            elif delta["stable"]:
+                print(f"Response captured: {len(current_text)} chars")
+                waiter.set_result(current_text)
+            else:
+                print(f"Response growing: {len(current_text)} chars")
     
     async def wait_for_response(self):
         """Wait for Grok response with character limit instead of timeout"""
         print("Waiting for response...")
-        last_text = ""
-        stable_count = 0
-        response_started = False
-        max_chars = self.config["max_response_chars"]
-        max_wait_time = self.config["max_wait_time"]
-        start_time = asyncio.get_event_loop().time()
+        interval_ms = self.stabilization_check_interval * 1000
+        max_chars = self.max_response_chars
+        self.response_text = ""
+        self.response_waiter = asyncio.get_running_loop().create_future()
         
-        while (asyncio.get_event_loop().time() - start_time) < max_wait_time:
-            # Check for UI errors
-            error_msg = await self.detect_ui_errors()
-            if error_msg and "grok" not in error_msg.lower():
-                # Rate limit detection
-                if "rate limit" in error_msg.lower() or "too many" in error_msg.lower():
-                    print("Rate limit detected, waiting...")
-                    await asyncio.sleep(30)
-                    continue
-                return f"Error: {error_msg}"
-            
-            # Check if we're still in the right state
-            if not await self.has_messages() and response_started:
-                return "Error: Lost thread view during response"
-            
-            current_text = await self.get_latest_response()
-            
-            if current_text and len(current_text) > self.config["min_response_length"]:
-                response_started = True
-                
-                # Check if we've hit the character limit
-                if len(current_text) >= max_chars:
-                    print(f"Character limit reached: {len(current_text)} chars, truncating")
-                    return current_text[:max_chars]
-                
-                if current_text == last_text:
-                    stable_count += 1
-                    if stable_count >= self.config["required_stable_checks"]:
-                        print(f"Response captured: {len(current_text)} chars")
-                        return current_text
-                else:
-                    stable_count = 0
-                    last_text = current_text
-                    print(f"Response growing: {len(current_text)} chars")
+        try:
+            if self.bound_page is self.grok_page:
+                # The page pushes updates as Grok streams instead of being polled
+                await self.grok_page.evaluate(self.RESPONSE_OBSERVER_JS, {
+                    "intervalMs": interval_ms,
+                    # Mutations mark activity exactly, so a short quiet period replaces
+                    # required_stable_checks polling intervals of idle wait
+                    "stableMs": self.response_quiet_seconds * 1000,
+                    "replyAfterCount": self.reply_after_count,
+                    "responseSelector": self.RESPONSE_SELECTOR,
+                    "errorSelector": self.ERROR_SELECTOR
+                })
+                return await asyncio.wait_for(self.response_waiter, self.max_wait_time)
             
-            await asyncio.sleep(self.config["stabilization_check_interval"])
+            # No binding - one evaluate that only returns when the wait is over
+            self.on_response_delta(None, await self.grok_page.evaluate(self.RESPONSE_POLLER_JS, {
+                "intervalMs": interval_ms,
+                "stableChecks": self.required_stable_checks,
+                "timeoutMs": self.max_wait_time * 1000,
+                "minLen": self.min_response_length,
+                "maxChars": max_chars,
+                "replyAfterCount": self.reply_after_count,
+                "responseSelector": self.RESPONSE_SELECTOR,
+                "errorSelector": self.ERROR_SELECTOR
+            }))
+            if self.response_waiter.done():
+                return self.response_waiter.result()
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.response_waiter = None
+            try:
+                await self.grok_page.evaluate("() => window.__grokStopObserver?.()")
+            except Exception:
+                pass
         
         # Fallback timeout handling
-        if last_text and len(last_text) > self.config["min_response_length"]:
+        last_text = self.response_text
+        if last_text and len(last_text) > self.min_response_length:
             print("Max wait time reached, returning response")
             return last_text[:max_chars] if len(last_text) > max_chars else last_text
         
         return "Error: No response received"
     
-    async def start_new_conversation(self):
+    async def start_new_conversation(self, has_messages=None):
         """Start a new conversation with retry and validation"""
-        if await self.is_new_conversation():
+        if has_messages is None:
+            has_messages = not await self.is_new_conversation()
+        if not has_messages:
             print("Already in new conversation")
             return True
         
         # Try new chat button first
-        for attempt in range(self.config["max_retries"]):
+        for attempt in range(self.max_retries):
             element = await self.find_element(self.NEW_CHAT_SELECTOR, "new chat button")
             if element:
                 try:
                     await element.click()
-                    await asyncio.sleep(self.config["new_conversation_wait"])
+                    # Returns as soon as the old messages are gone
+                    await self.wait_for_state(self.RESPONSE_SELECTOR, "detached", self.new_conversation_wait)
                     
                     if await self.is_new_conversation():
                         print("Started new conversation")
@@ -447,16 +679,15 @@ class GrokAutomator:
                 except Exception as e:
                     print(f"New chat button failed: {e}")
             
-            if attempt < self.config["max_retries"] - 1:
-                await asyncio.sleep(self.config["retry_delay"])
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(self.retry_delay)
         
         # Fallback: direct navigation
         print("Trying direct navigation...")
         for attempt in range(2):  # Fewer retries for navigation
             try:
                 await self.grok_page.goto("https://grok.com")
-                await self.grok_page.wait_for_load_state("networkidle")
-                await asyncio.sleep(2)
+                await self.wait_for_page_ready()
                 
                 if await self.is_new_conversation():
                     print("Navigation successful")
@@ -474,30 +705,34 @@ class GrokAutomator:
         """Process a single prompt with comprehensive error recovery"""
         print(f"Processing prompt {prompt_id}: {prompt_text[:50]}...")
         
-        for attempt in range(self.config["max_retries"]):
+        for attempt in range(self.max_retries):
             try:
-                # Check for persistent UI errors
-                error_msg = await self.detect_ui_errors()
+                # Check for persistent UI errors and conversation state in one call
+                snapshot = await self.get_snapshot()
+                error_msg = snapshot["error"]
                 if error_msg and "grok" not in error_msg.lower():
                     print(f"Pre-prompt UI error: {error_msg}")
-                    if attempt < self.config["max_retries"] - 1:
+                    if attempt < self.max_retries - 1:
                         await self.grok_page.reload()
-                        await self.grok_page.wait_for_load_state("networkidle")
-                        await asyncio.sleep(2)
+                        await self.wait_for_page_ready()
                         continue
                     return {"id": prompt_id, "prompt": prompt_text, "grok_reply": f"Error: Persistent UI error - {error_msg}"}
                 
                 # Ensure new conversation
-                if not await self.start_new_conversation():
-                    if attempt < self.config["max_retries"] - 1:
+                if not await self.start_new_conversation(snapshot["count"] > 0):
+                    if attempt < self.max_retries - 1:
                         print("Retrying new conversation...")
-                        await asyncio.sleep(self.config["retry_delay"])
+                        await asyncio.sleep(self.retry_delay)
                         continue
                     return {"id": prompt_id, "prompt": prompt_text, "grok_reply": "Error: Could not start new conversation"}
                 
+                # Grok's reply is the first message past the user's own prompt bubble
+                self.reply_after_count = (await self.get_snapshot())["count"] + 1
+                
                 # Try voice mode first, fallback to text
                 input_success = False
-                if await self.try_voice_mode():
+                self.voice_clicked = False
+                if self.voice_enabled and not self.voice_broken and await self.try_voice_mode():
                     input_success = await self.generate_and_stream_tts(prompt_text)
                     if not input_success:
                         print("TTS failed, falling back to text")
@@ -506,25 +741,31 @@ class GrokAutomator:
                     input_success = await self.send_text_input(prompt_text)
                 
                 if not input_success:
-                    if attempt < self.config["max_retries"] - 1:
+                    if attempt < self.max_retries - 1:
                         print("Input failed, retrying...")
-                        await asyncio.sleep(self.config["retry_delay"])
+                        await asyncio.sleep(self.retry_delay)
                         continue
                     return {"id": prompt_id, "prompt": prompt_text, "grok_reply": "Error: Failed to send input after retries"}
                 
+                # Synthesize the next prompt's speech while Grok is responding
+                if self.voice_enabled and not self.voice_broken:
+                    self.prefetch_speech(self.next_prompt_text)
+                
                 # Wait for response
                 response = await self.wait_for_response()
                 
                 # Validate response
                 if response.startswith("Error:"):
-                    if attempt < self.config["max_retries"] - 1:
+                    if attempt < self.max_retries - 1:
                         print(f"Response error, retrying: {response}")
-                        await asyncio.sleep(self.config["retry_delay"])
+                        await asyncio.sleep(self.retry_delay)
                         continue
                 
                 # Exit voice mode after getting response, before moving to next prompt
-                print("Exiting voice mode after response...")
-                await self.exit_voice_mode()
+                # (also when voice failed after the click, which can leave it open)
+                if self.voice_clicked:
+                    print("Exiting voice mode after response...")
+                    await self.exit_voice_mode()
                 
                 print(f"Completed prompt {prompt_id}")
                 return {
@@ -535,14 +776,14 @@ class GrokAutomator:
                 
             except Exception as e:
                 print(f"Error processing prompt {prompt_id} (attempt {attempt + 1}): {e}")
-                if attempt < self.config["max_retries"] - 1:
-                    await asyncio.sleep(self.config["retry_delay"])
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(self.retry_delay)
                     continue
         
-        return {"id": prompt_id, "prompt": prompt_text, "grok_reply": f"Error: Failed after {self.config['max_retries']} attempts"}
+        return {"id": prompt_id, "prompt": prompt_text, "grok_reply": f"Error: Failed after {self.max_retries} attempts"}
     
     
-    async def run_automation(self, prompts_file="prompts.csv", results_file=None, resume=False):
+    async def run_automation(self, prompts_file="prompts.csv", results_file=None, resume=False, workers=1):
         """Run the complete automation pipeline"""
         print("Starting GrokAutomation v0...")
         
@@ -560,71 +801,129 @@ class GrokAutomator:
         if not await self.connect_to_chrome_with_retry():
             return False
         
+        results_fh = None
+        automators = [self]
+        worker_tasks = []
+        writer_task = None
         try:
             # Load prompts
             print(f"Loading prompts from {prompts_file}")
-            df = pd.read_csv(prompts_file, encoding='utf-8')
-            print(f"Loaded {len(df)} prompts")
-            
-            # Validate CSV columns
-            required_columns = ['id', 'text']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                raise ValueError(f"Missing required columns in {prompts_file}: {missing_columns}")
+            with open(prompts_file, newline='', encoding='utf-8-sig') as f:
+                reader = csv.DictReader(f)
+                
+                # Validate CSV columns
+                required_columns = ['id', 'text']
+                missing_columns = [col for col in required_columns if col not in (reader.fieldnames or [])]
+                if missing_columns:
+                    raise ValueError(f"Missing required columns in {prompts_file}: {missing_columns}")
+                rows = list(reader)
+            print(f"Loaded {len(rows)} prompts")
             print(f"CSV validation passed")
             
             # Filter out already completed prompts if resuming
             if completed_ids:
-                original_count = len(df)
-                df = df[~df['id'].isin(completed_ids)]
-                skipped_count = original_count - len(df)
+                original_count = len(rows)
+                rows = [row for row in rows if row['id'] not in completed_ids]
+                skipped_count = original_count - len(rows)
                 print(f"Skipping {skipped_count} already completed prompts")
-                if len(df) == 0:
+                if len(rows) == 0:
                     print("All prompts already completed!")
                     return True
             
+            # One buffered writer for the whole run instead of a DataFrame per result
+            write_header = not os.path.exists(results_file) or os.path.getsize(results_file) == 0
+            results_fh = open(results_file, 'a', newline='', encoding='utf-8', buffering=1 << 20)
+            writer = csv.DictWriter(results_fh, fieldnames=["id", "prompt", "grok_reply"])
+            if write_header:
+                writer.writeheader()
+            
+            # Extra workers share this browser connection, each in its own tab
+            for _ in range(workers - 1):
+                try:
+                    automators.append(await self.open_worker())
+                except Exception as e:
+                    print(f"Could not open worker tab: {e}")
+            if len(automators) > 1:
+                # Every tab would hear the same virtual microphone
+                print(f"Running {len(automators)} workers with text input")
+                for automator in automators:
+                    automator.voice_enabled = False
+            
             # Process all prompts (or limit for testing)
-            self.results = []
-            total_prompts = len(df)
+            self.results_written = 0
+            total_prompts = len(rows)
+            started = 0
+            pending = asyncio.Queue()
+            finished = asyncio.Queue()
+            for row in rows + [None] * len(automators):
+                pending.put_nowait(row)
             
-            for i, (index, row) in enumerate(df.iterrows()):
-                current_prompt = i + 1
-                remaining = total_prompts - current_prompt
-                
-                # Progress display
-                progress = current_prompt / total_prompts
-                bar_length = self.config["progress_bar_length"]
-                filled_length = int(bar_length * progress)
-                bar = '#' * filled_length + '-' * (bar_length - filled_length)
-                
-                print(f"\n{'-'*60}")
-                print(f"PROMPT {current_prompt}/{total_prompts} | ID: {row['id']} | {remaining} remaining")
-                print(f"Progress: [{bar}] {progress:.1%}")
-                print(f"Text: {row['text'][:80]}{'...' if len(row['text']) > 80 else ''}")
-                print(f"{'-'*60}")
-                
-                result = await self.process_prompt(row['id'], row['text'])
-                self.results.append(result)
-                
-                # Save each result immediately
-                result_df = pd.DataFrame([result])
-                if not os.path.exists(results_file):
-                    # Create file with header if it doesn't exist
-                    result_df.to_csv(results_file, index=False, encoding='utf-8')
-                else:
-                    # Append without header if file exists
-                    result_df.to_csv(results_file, mode='a', header=False, index=False, encoding='utf-8')
-                
-                # Prepare for next prompt (handled in process_prompt)
-                if i < len(df) - 1:
-                    await asyncio.sleep(1)  # Brief pause between prompts
+            async def work(automator):
+                nonlocal started
+                row = await pending.get()
+                while row:
+                    started += 1
+                    remaining = total_prompts - started
+                    
+                    # Progress display
+                    progress = started / total_prompts
+                    bar_length = self.progress_bar_length
+                    filled_length = int(bar_length * progress)
+                    bar = '#' * filled_length + '-' * (bar_length - filled_length)
+                    
+                    print(f"\n{'-'*60}")
+                    print(f"PROMPT {started}/{total_prompts} | ID: {row['id']} | {remaining} remaining")
+                    print(f"Progress: [{bar}] {progress:.1%}")
+                    print(f"Text: {row['text'][:80]}{'...' if len(row['text']) > 80 else ''}")
+                    print(f"{'-'*60}")
+                    
+                    # First prompt's speech synthesizes while the conversation is being reset
+                    # (later ones are already prefetched, making this a no-op)
+                    if automator.voice_enabled and not automator.voice_broken:
+                        automator.prefetch_speech(row['text'])
+                    
+                    # With voice, claim the next row now so its speech can be synthesized during
+                    # this one; text-only workers leave it for whichever tab is free first
+                    upcoming = None
+                    if automator.voice_enabled:
+                        upcoming = await pending.get()
+                        automator.next_prompt_text = upcoming['text'] if upcoming else None
+                    await finished.put(await automator.process_prompt(row['id'], row['text']))
+                    
+                    # Prepare for next prompt (handled in process_prompt)
+                    row = upcoming if automator.voice_enabled else await pending.get()
+                    if row:
+                        await asyncio.sleep(1)  # Brief pause between prompts
+            
+            async def write_results():
+                # Single writer so rows from concurrent workers never interleave
+                done = False
+                while not done:
+                    batch = [await finished.get()]
+                    # Write whatever else has finished meanwhile in the same batch
+                    while not finished.empty():
+                        batch.append(finished.get_nowait())
+                    if None in batch:
+                        done = True
+                        batch.remove(None)
+                    self.results_written += len(batch)
+                    # Save results immediately so resume never loses a finished prompt
+                    writer.writerows(batch)
+                    results_fh.flush()
+                    os.fsync(results_fh.fileno())
+            
+            writer_task = asyncio.create_task(write_results())
+            worker_tasks = [asyncio.create_task(work(automator)) for automator in automators]
+            await asyncio.gather(*worker_tasks)
+            await finished.put(None)
+            await writer_task
             
             # Results are saved immediately after each prompt
             
             print(f"\n{'-'*60}")
             print(f"AUTOMATION COMPLETE")
             print(f"Results saved to: {results_file}")
-            print(f"Successfully processed: {len(self.results)}/{total_prompts} prompts")
+            print(f"Successfully processed: {self.results_written}/{total_prompts} prompts")
             print(f"{'-'*60}")
             
             return True
@@ -634,8 +933,23 @@ class GrokAutomator:
             return False
             
         finally:
-            # Don't close browser - leave tab open
-            pass
+            # One failed worker doesn't stop the others - stop them before their tabs
+            # close, then let the writer save whatever they had already finished
+            for task in worker_tasks:
+                task.cancel()
+            await asyncio.gather(*worker_tasks, return_exceptions=True)
+            if writer_task and not writer_task.done():
+                await finished.put(None)
+                await asyncio.gather(writer_task, return_exceptions=True)
+            
+            # Don't close browser - leave tab open, but close extra worker tabs
+            for automator in automators[1:]:
+                try:
+                    await automator.grok_page.close()
+                except Exception:
+                    pass
+            if results_fh:
+                results_fh.close()
     
     async def cleanup(self):
         """Properly cleanup resources"""
@@ -653,6 +967,7 @@ async def main():
     parser.add_argument("--input", "-i", default="prompts.csv", help="Input CSV file with prompts (default: prompts.csv)")
     parser.add_argument("--output", "-o", help="Output CSV file for results (default: timestamped filename)")
     parser.add_argument("--resume", "-r", action="store_true", help="Resume from existing results file")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Prompts to run concurrently in separate tabs, text input only when >1 (default: 1)")
     
     args = parser.parse_args()
     
@@ -661,7 +976,8 @@ async def main():
         success = await automator.run_automation(
             prompts_file=args.input,
             results_file=args.output,
-            resume=args.resume
+            resume=args.resume,
+            workers=args.workers
         )
         
         if success:
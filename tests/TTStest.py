@@ -5,12 +5,12 @@ Plays a test prompt through current default audio output device
 """
 
 import asyncio
-import tempfile
 import os
+import sys
 import json
-import edge_tts
-import sounddevice as sd
-import soundfile as sf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tts_stream import speak
 
 def load_config():
     """Load configuration from config.json"""
@@ -29,34 +29,13 @@ async def test_tts(prompt: str = "Hello, this is a test of the text to speech sy
     print(f"Converting to speech: '{prompt}'")
     print(f"Using voice: {voice} with rate: {rate}")
     
-    # Create temporary file for audio
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-        tmp_path = tmp_file.name
-    
     try:
-        # Generate TTS audio using edge-tts with config settings
-        communicate = edge_tts.Communicate(prompt, voice, rate=rate)
-        await communicate.save(tmp_path)
-        
-        print(f"Audio saved to: {tmp_path}")
-        
-        # Load and play the audio file using sounddevice
-        data, samplerate = sf.read(tmp_path)
-        
         print("Playing audio...")
-        sd.play(data, samplerate)
-        sd.wait()  # Wait for playback to complete
-        
+        await speak(prompt, voice, rate)
         print("Playback complete!")
         
     except Exception as e:
         print(f"Error: {e}")
-        
-    finally:
-        # Cleanup
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-            print("Temporary file cleaned up")
 
 if __name__ == "__main__":
     # Test with default prompt
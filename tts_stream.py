@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Shared TTS pipeline: edge-tts streamed into memory, decoded to int16 and
+played through a raw sounddevice output stream
+"""
+
+import asyncio
+import io
+import edge_tts
+import sounddevice as sd
+import soundfile as sf
+
+async def synthesize(text, voice, rate="+0%"):
+    """Generate TTS audio with edge-tts and return the encoded bytes"""
+    communicate = edge_tts.Communicate(text, voice, rate=rate)
+    audio = io.BytesIO()
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            audio.write(chunk["data"])
+    return audio.getvalue()
+
+def play(audio, device=None):
+    """Decode encoded audio to int16 and play it, blocking until playback completes"""
+    # Decode straight from memory - no temp file, no float64 upcast
+    data, samplerate = sf.read(io.BytesIO(audio), dtype="int16")
+    channels = 1 if data.ndim == 1 else data.shape[1]
+    # Closing the stream waits for playback to complete
+    with sd.RawOutputStream(samplerate=samplerate, channels=channels, dtype="int16",
+                            device=device) as stream:
+        stream.write(data)
+
+async def speak(text, voice, rate="+0%", device=None):
+    """Synthesize text and play it without blocking the event loop"""
+    await asyncio.to_thread(play, await synthesize(text, voice, rate), device)